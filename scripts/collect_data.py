@@ -36,6 +36,11 @@ def parse_arguments():
     parser.add_argument(
         "--days", type=int, default=30, help="Days from today to search for events"
     )
+    parser.add_argument(
+        "--all-pages",
+        action="store_true",
+        help="Fetch every page of results (up to the API's 1000-result limit)",
+    )
     parser.add_argument(
         "--tracked-only",
         action="store_true",  # Boolean flag, no value needed
@@ -95,6 +100,10 @@ def main():
         "classification_name": args.type,
         "size": args.size,
     }
+    if args.all_pages:
+        # --size would be the page size; let the client use full pages
+        del search_params["size"]
+        search_params["all_pages"] = True
 
     # Handle tracked-only mode
     if args.tracked_only:
@@ -103,6 +112,7 @@ def main():
 
         print(f"\nProcessed {results['fetched']} tracked events")
         print(f"  Updated: {results['updated']} events")
+        print(f"  Unchanged: {results['unchanged']} events (same price)")
         print(f"  Skipped: {results.get('skipped', 0)} past events")
         print(f"  Errors: {len(results['errors'])}")
 
@@ -125,6 +135,7 @@ def main():
     print("Storing in database...")
     print(f"  Created: {results['created']} new events")
     print(f"  Updated: {results['updated']} existing events")
+    print(f"  Unchanged: {results['unchanged']} existing events (same price)")
     print(f"  Errors: {len(results['errors'])}")
 
     if results["errors"]:
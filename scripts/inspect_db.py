@@ -3,10 +3,12 @@
 """Inspect database contents"""
 
 import sys
+from collections import defaultdict
 from pathlib import Path
 
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
+from sqlalchemy import func
 from src.config import Config
 from src.db.database import Database
 from src.db.models import Event, PriceSnapshot, UserInterest
@@ -16,77 +18,92 @@ def main():
     Config.validate()
     db = Database()
 
+    # Collect output and write it once at the end
+    out = []
+
     with db.get_session() as session:
         # Count records
         event_count = session.query(Event).count()
         snapshot_count = session.query(PriceSnapshot).count()
         interest_count = session.query(UserInterest).count()
 
-        print("Database Contents:")
-        print(f"  Events: {event_count}")
-        print(f"  Price Snapshots: {snapshot_count}")
-        print(f"  User Interests: {interest_count}")
-        print()
+        out.append("Database Contents:")
+        out.append(f"  Events: {event_count}")
+        out.append(f"  Price Snapshots: {snapshot_count}")
+        out.append(f"  User Interests: {interest_count}")
+        out.append("")
 
         # Show events
-        print("=" * 80)
-        print("EVENTS:")
-        print("=" * 80)
+        out.append("=" * 80)
+        out.append("EVENTS:")
+        out.append("=" * 80)
         events = session.query(Event).all()
+
+        # Count snapshots for all events in one query
+        snap_counts = dict(
+            session.query(PriceSnapshot.event_id, func.count())
+            .group_by(PriceSnapshot.event_id)
+            .all()
+        )
+
         for event in events:
-            print(f"\n{event.id}")
-            print(f"  Name: {event.name}")
-            print(f"  Date: {event.start_date}")
-            print(f"  Venue: {event.venue_name}, {event.city}, {event.state}")
-
-            # Count snapshots for this event
-            snap_count = (
-                session.query(PriceSnapshot).filter_by(event_id=event.id).count()
-            )
-            print(f"  Price Snapshots: {snap_count}")
+            out.append(f"\n{event.id}")
+            out.append(f"  Name: {event.name}")
+            out.append(f"  Date: {event.start_date}")
+            out.append(f"  Venue: {event.venue_name}, {event.city}, {event.state}")
+            out.append(f"  Price Snapshots: {snap_counts.get(event.id, 0)}")
 
         # Show tracked events
-        print("\n" + "=" * 80)
-        print("TRACKED EVENTS:")
-        print("=" * 80)
+        out.append("\n" + "=" * 80)
+        out.append("TRACKED EVENTS:")
+        out.append("=" * 80)
         interests = session.query(UserInterest).all()
         for interest in interests:
-            event = session.query(Event).filter_by(id=interest.event_id).first()
+            # Events are all loaded above, so this doesn't query
+            event = interest.event
             status = "✓ Active" if interest.is_active else "✗ Inactive"
-            print(f"\n{status} - {event.name if event else interest.event_id}")
-            print(f"  User: {interest.user_email}")
-            print(
+            out.append(f"\n{status} - {event.name if event else interest.event_id}")
+            out.append(f"  User: {interest.user_email}")
+            out.append(
                 f"  Target Price: ${interest.target_price}"
                 if interest.target_price
                 else "  No target price"
             )
-            print(f"  Tracking since: {interest.created_at}")
+            out.append(f"  Tracking since: {interest.created_at}")
 
         # Show price history for tracked events
-        print("\n" + "=" * 80)
-        print("PRICE HISTORY (Tracked Events):")
-        print("=" * 80)
+        out.append("\n" + "=" * 80)
+        out.append("PRICE HISTORY (Tracked Events):")
+        out.append("=" * 80)
+
+        # Load price history for all active interests in one query
+        active_ids = {i.event_id for i in interests if i.is_active}
+        snaps_by_event = defaultdict(list)
+        for snap in (
+            session.query(PriceSnapshot)
+            .filter(PriceSnapshot.event_id.in_(active_ids))
+            .order_by(PriceSnapshot.snapshot_time)
+        ):
+            snaps_by_event[snap.event_id].append(snap)
+
         for interest in interests:
             if not interest.is_active:
                 continue
 
-            event = session.query(Event).filter_by(id=interest.event_id).first()
-            snapshots = (
-                session.query(PriceSnapshot)
-                .filter_by(event_id=interest.event_id)
-                .order_by(PriceSnapshot.snapshot_time)
-                .all()
-            )
+            event = interest.event
+            snapshots = snaps_by_event[interest.event_id]
 
-            print(f"\n{event.name if event else interest.event_id}")
-            print(f"  Price History ({len(snapshots)} snapshots):")
+            out.append(f"\n{event.name if event else interest.event_id}")
+            out.append(f"  Price History ({len(snapshots)} snapshots):")
             for snap in snapshots:
                 price_str = (
                     f"${snap.min_price}-${snap.max_price}"
                     if snap.min_price
                     else "No price"
                 )
-                print(f"    {snap.snapshot_time}: {price_str}")
+                out.append(f"    {snap.snapshot_time}: {price_str}")
+
+    sys.stdout.write("\n".join(out) + "\n")
 
 
 if __name__ == "__main__":
@@ -49,7 +49,7 @@ def track_event(event_id: str, user_email: str, target_price: float = None):
 
     with database.get_session() as session:
         # 2. Check if event exists in DB
-        event = session.query(Event).filter_by(id=event_id).first()
+        event = session.get(Event, event_id)
 
         # 3. If not, fetch from API and store
         if not event:
@@ -62,11 +62,11 @@ def track_event(event_id: str, user_email: str, target_price: float = None):
                 return False
 
             parsed = api_client.parse_event_data(api_event)
-            result = collector.store_event(parsed)
+            result = collector.store_event(parsed, session=session)
 
             if result:
                 print(f"✓ Stored event: {parsed['name']}")
-                event = session.query(Event).filter_by(id=event_id).first()
+                event = session.get(Event, event_id)
             else:
                 print("Error: Failed to store event")
                 return False
@@ -0,0 +1,37 @@
+import threading
+import time
+
+
+class RateLimiter:
+    """Thread-safe token bucket allowing a fixed number of requests per period
+
+    At most `burst` requests go out back-to-back; after that they are spaced
+    evenly at max_requests / period per second.
+    """
+
+    def __init__(self, max_requests: int, period: float = 60.0, burst: int = 1):
+        self.capacity = burst
+        self.refill_rate = max_requests / period  # tokens per second
+        self.tokens = float(burst)
+        self.updated_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """Block until a request may be made, then consume one token"""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                elapsed = now - self.updated_at
+                self.tokens = min(
+                    self.capacity, self.tokens + elapsed * self.refill_rate
+                )
+                self.updated_at = now
+
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+
+                wait = (1 - self.tokens) / self.refill_rate
+
+            # Sleep outside the lock so other threads can refill/check
+            time.sleep(wait)
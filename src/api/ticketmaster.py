@@ -1,28 +1,105 @@
+import threading
+import time
+import orjson
 import requests
-from typing import Dict, List, Optional
+from functools import lru_cache
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from typing import Dict, Iterator, List, Optional
 from datetime import datetime
+from src.api.rate_limiter import RateLimiter
 from src.config import Config
 
+# Ticketmaster only pages through the first 1000 results (size * page < 1000)
+MAX_PAGED_RESULTS = 1000
+
+
+@lru_cache(maxsize=8192)
+def _parse_datetime(value: str) -> Optional[datetime]:
+    """Parse an API timestamp (cached: many events share the same start time)"""
+    try:
+        # fromisoformat accepts the "Z" suffix natively on Python 3.11+
+        return datetime.fromisoformat(value)
+    except ValueError:
+        return None
+
 
 class TicketmasterAPI:
     """Client for interacting with Ticketmaster Discovery API"""
 
-    def __init__(self, api_key: str = None):
+    def __init__(self, api_key: str = None, cache_ttl: float = None):
         self.api_key = api_key or Config.TICKETMASTER_API_KEY
         self.base_url = Config.TICKETMASTER_BASE_URL
+        self.cache_ttl = Config.API_CACHE_TTL if cache_ttl is None else cache_ttl
 
         if not self.api_key:
             raise ValueError("Ticketmaster API key is required")
 
-    def _make_request(self, endpoint: str, params: Dict) -> Dict:
-        """Make a request to the Ticketmaster API"""
+        # Reuse connections across requests instead of a new TCP/TLS handshake each
+        # time; one pooled connection per concurrent worker so none are discarded
+        self.session = requests.Session()
+        # raise_on_status=False hands the last response to raise_for_status(),
+        # so exhausted retries still surface as HTTPError
+        retries = Retry(
+            total=3,
+            backoff_factor=0.3,
+            status_forcelist=[429, 500, 502, 503, 504],
+            raise_on_status=False,
+        )
+        self.session.mount(
+            "https://",
+            HTTPAdapter(
+                pool_maxsize=Config.MAX_CONCURRENT_REQUESTS, max_retries=retries
+            ),
+        )
+
+        # Keep sustained traffic under the API's per-minute quota
+        self.rate_limiter = RateLimiter(
+            Config.MAX_REQUESTS_PER_MINUTE, period=60, burst=Config.MAX_REQUEST_BURST
+        )
+
+        # Responses keyed by (endpoint, params) -> (expires_at, data)
+        self._cache: Dict[tuple, tuple] = {}
+        self._cache_lock = threading.Lock()
+
+    def _make_request(self, endpoint: str, params: Dict, cache: bool = True) -> Dict:
+        """Make a request to the Ticketmaster API, reusing recent responses"""
+        cache_key = (endpoint, tuple(sorted(params.items())))
+
+        with self._cache_lock:
+            cached = self._cache.get(cache_key)
+        if cached and cached[0] > time.monotonic():
+            return cached[1]
+
         url = f"{self.base_url}/{endpoint}"
         params["apikey"] = self.api_key
 
-        response = requests.get(url, params=params)
+        self.rate_limiter.acquire()
+        response = self.session.get(url, params=params, timeout=10)
         response.raise_for_status()
-
-        return response.json()
+        data = orjson.loads(response.content)
+
+        if cache and self.cache_ttl > 0:
+            now = time.monotonic()
+            with self._cache_lock:
+                # Entries share one TTL, so insertion order is expiry order:
+                # drop expired ones from the front instead of letting them pile up
+                while self._cache:
+                    oldest = next(iter(self._cache))
+                    if self._cache[oldest][0] > now:
+                        break
+                    del self._cache[oldest]
+
+                # Re-insert at the back so the order stays by expiry
+                self._cache.pop(cache_key, None)
+                self._cache[cache_key] = (now + self.cache_ttl, data)
+
+        return data
+
+    def clear_cache(self):
+        """Forget all cached responses (e.g. when fresh prices are needed)"""
+        with self._cache_lock:
+            self._cache.clear()
 
     def search_events(
         self,
@@ -47,6 +124,55 @@ class TicketmasterAPI:
         Returns:
             List of event dictionaries
         """
+        params = self._search_params(
+            keyword, city, state_code, classification_name, start_date, size
+        )
+        response = self._make_request("events.json", params)
+
+        return self._extract_events(response)
+
+    def iter_events(
+        self,
+        keyword: str = None,
+        city: str = None,
+        state_code: str = None,
+        classification_name: str = None,
+        start_date: str = None,
+        size: int = 200,
+    ) -> Iterator[Dict]:
+        """
+        Iterate over events across all pages of results, one page at a time
+
+        Each page is only requested once the previous one has been consumed,
+        so at most one page of events is held in memory.
+
+        Args:
+            Same as search_events; size is the number of results per page
+
+        Yields:
+            Event dictionaries
+        """
+        params = self._search_params(
+            keyword, city, state_code, classification_name, start_date, size
+        )
+        last_page = (MAX_PAGED_RESULTS - 1) // size + 1
+
+        page = 0
+        while page < last_page:
+            # Not cached: the cache would keep every page alive
+            response = self._make_request(
+                "events.json", {**params, "page": page}, cache=False
+            )
+            yield from self._extract_events(response)
+
+            total_pages = response.get("page", {}).get("totalPages", 1)
+            last_page = min(last_page, total_pages)
+            page += 1
+
+    def _search_params(
+        self, keyword, city, state_code, classification_name, start_date, size
+    ) -> Dict:
+        """Build query parameters for the events search endpoint"""
         params = {"size": size}
 
         if keyword:
@@ -60,9 +186,10 @@ class TicketmasterAPI:
         if start_date:
             params["startDateTime"] = start_date
 
-        response = self._make_request("events.json", params)
+        return params
 
-        # Extract events from response
+    def _extract_events(self, response: Dict) -> List[Dict]:
+        """Extract events from a search response"""
         if "_embedded" in response and "events" in response["_embedded"]:
             return response["_embedded"]["events"]
 
@@ -71,7 +198,8 @@ class TicketmasterAPI:
     def get_event_details(self, event_id: str) -> Optional[Dict]:
         """Get detailed information about a specific event"""
         try:
-            response = self._make_request(f"events/{event_id}.json", {})
+            # Not cached: callers look events up to get their current prices
+            response = self._make_request(f"events/{event_id}.json", {}, cache=False)
             return response
         except requests.exceptions.HTTPError:
             return None
@@ -79,40 +207,40 @@ class TicketmasterAPI:
     def parse_event_data(self, event: Dict) -> Dict:
         """Parse raw event data into a structured format"""
         # Extract price range
-        price_ranges = event.get("priceRanges", [])
-        min_price = None
-        max_price = None
-        currency = "USD"
-
-        if price_ranges:
-            min_price = price_ranges[0].get("min")
-            max_price = price_ranges[0].get("max")
-            currency = price_ranges[0].get("currency", "USD")
+        try:
+            price_range = event["priceRanges"][0]
+            min_price = price_range.get("min")
+            max_price = price_range.get("max")
+            currency = price_range.get("currency", "USD")
+        except (KeyError, IndexError):
+            min_price = max_price = None
+            currency = "USD"
 
         # Extract venue information
-        venues = event.get("_embedded", {}).get("venues", [])
-        venue_name = venues[0].get("name") if venues else None
-        city = venues[0].get("city", {}).get("name") if venues else None
-        state = venues[0].get("state", {}).get("stateCode") if venues else None
+        try:
+            venue = event["_embedded"]["venues"][0]
+        except (KeyError, IndexError):
+            venue_name = city = state = None
+        else:
+            venue_name = venue.get("name")
+            city = venue["city"].get("name") if "city" in venue else None
+            state = venue["state"].get("stateCode") if "state" in venue else None
 
         # Extract dates
-        dates = event.get("dates", {})
-        start_date_str = dates.get("start", {}).get("dateTime")
-        start_date = None
-        if start_date_str:
-            try:
-                start_date = datetime.fromisoformat(
-                    start_date_str.replace("Z", "+00:00")
-                )
-            except ValueError:
-                pass
+        try:
+            start_date_str = event["dates"]["start"]["dateTime"]
+        except KeyError:
+            start_date_str = None
+        start_date = _parse_datetime(start_date_str) if start_date_str else None
 
         # Extract classifications
-        classifications = event.get("classifications", [])
-        event_type = None
-        if classifications:
-            segment = classifications[0].get("segment", {}).get("name")
-            genre = classifications[0].get("genre", {}).get("name")
+        try:
+            classification = event["classifications"][0]
+        except (KeyError, IndexError):
+            event_type = None
+        else:
+            segment = classification.get("segment", {}).get("name")
+            genre = classification.get("genre", {}).get("name")
             event_type = f"{segment}/{genre}" if segment and genre else segment or genre
 
         return {
@@ -146,10 +274,12 @@ if __name__ == "__main__":
     api = TicketmasterAPI()
 
     # Search for concerts in Los Angeles (next 30 days to get more recent events with pricing)
-    from datetime import datetime, timedelta
+    from datetime import timedelta, timezone
 
-    start_date = datetime.now().strftime("%Y-%m-%dT%H:%M:%SZ")
-    end_date = (datetime.now() + timedelta(days=30)).strftime("%Y-%m-%dT%H:%M:%SZ")
+    # Read the clock once; the API expects UTC timestamps with a Z suffix
+    now = datetime.now(timezone.utc)
+    start_date = now.strftime("%Y-%m-%dT%H:%M:%SZ")
+    end_date = (now + timedelta(days=30)).strftime("%Y-%m-%dT%H:%M:%SZ")
 
     print("Searching for upcoming concerts in Los Angeles (next 30 days)...")
     events = api.search_events(
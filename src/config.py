@@ -13,6 +13,11 @@ class Config:
 
     # API rate limiting
     MAX_REQUESTS_PER_MINUTE = 60
+    MAX_REQUEST_BURST = 5  # requests a cold client may send back-to-back
+    MAX_CONCURRENT_REQUESTS = 16
+
+    # Seconds to reuse an identical API response (0 disables caching)
+    API_CACHE_TTL = 300
 
     @classmethod
     def validate(cls):
@@ -1,149 +1,319 @@
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import nullcontext
+from sqlalchemy import and_, bindparam, func, insert, select, update
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from src.config import Config
 from src.db.models import Event, PriceSnapshot, UserInterest
-from typing import Dict, Any
+from typing import Dict, Any, Iterator, List, Set, Tuple
 from datetime import datetime, timezone
 
+# Parsed events stored per transaction when streaming search results
+STORE_CHUNK_SIZE = 500
+
+# Dialect-specific INSERTs that support ON CONFLICT DO NOTHING
+_INSERT_BY_DIALECT = {"sqlite": sqlite_insert, "postgresql": postgresql_insert}
+
+# Built once so each batch reuses the same statement (and its cached compilation)
+_SELECT_EXISTING_EVENT_IDS = select(Event.id).where(
+    Event.id.in_(bindparam("ids", expanding=True))
+)
+
+# Most recent snapshot's prices for each of the given events
+_latest_snapshot_times = (
+    select(
+        PriceSnapshot.event_id,
+        func.max(PriceSnapshot.snapshot_time).label("snapshot_time"),
+    )
+    .where(PriceSnapshot.event_id.in_(bindparam("ids", expanding=True)))
+    .group_by(PriceSnapshot.event_id)
+    .subquery()
+)
+_SELECT_LATEST_PRICES = select(
+    PriceSnapshot.event_id,
+    PriceSnapshot.min_price,
+    PriceSnapshot.max_price,
+    PriceSnapshot.currency,
+).join(
+    _latest_snapshot_times,
+    and_(
+        PriceSnapshot.event_id == _latest_snapshot_times.c.event_id,
+        PriceSnapshot.snapshot_time == _latest_snapshot_times.c.snapshot_time,
+    ),
+)
+
+# Tracked-events refresh: retire interests in past events, then list the rest
+_DEACTIVATE_PAST_INTERESTS = (
+    update(UserInterest)
+    .where(
+        UserInterest.is_active.is_(True),
+        UserInterest.event_id.in_(
+            select(Event.id).where(Event.start_date < bindparam("now"))
+        ),
+    )
+    .values(is_active=False)
+)
+_SELECT_ACTIVE_EVENT_IDS = select(UserInterest.event_id).where(
+    UserInterest.is_active.is_(True)
+)
+
 
 class DataCollector:
     def __init__(self, api_client, database):
         self.api_client = api_client
         self.database = database
-
-    def store_event(self, event_data: Dict[str, Any]) -> str:
+        # Latest stored (min, max, currency) of each event written by this
+        # collector, so repeat batches skip the existence and price queries
+        self._latest_prices: Dict[str, Tuple] = {}
+
+    @staticmethod
+    def _existing_event_ids(session, ids) -> Set[str]:
+        """Return which of the given event IDs are already stored, in one query"""
+        if not ids:
+            return set()
+        return set(
+            session.execute(_SELECT_EXISTING_EVENT_IDS, {"ids": list(ids)}).scalars()
+        )
+
+    def store_event(self, event_data: Dict[str, Any], session=None) -> str:
         """
         Store event and its price snapshot in the database
 
+        If a session is given, the writes join its transaction and are
+        committed by the caller.
+
         TODO: Add status field to distinguish between sold_out,
         unavailable (TBA), and error states. See GitHub issue #X
         """
-        event_id = event_data["id"]
+        counts = self.store_events([event_data], session=session)
+        if counts["created"]:
+            return "created"
+        return "unchanged" if counts["unchanged"] else "updated"
 
-        with self.database.get_session() as session:
-            # Check if event already exists
-            event = session.query(Event).filter_by(id=event_id).first()
-
-            # Add new PriceSnapshot
-            snapshot = PriceSnapshot(
-                event_id=event_id,
-                min_price=event_data.get("min_price"),
-                max_price=event_data.get("max_price"),
-                currency=event_data.get("currency", "USD"),
-            )
-            session.add(snapshot)
-
-            if not event:
-                # Create new Event
-                event = Event(
-                    id=event_id,
-                    name=event_data["name"],
-                    event_type=event_data.get("event_type"),
-                    start_date=event_data.get("start_date"),
-                    venue_name=event_data.get("venue_name"),
-                    city=event_data.get("city"),
-                    state=event_data.get("state"),
-                    url=event_data.get("url"),
+    def store_events(self, batch: List[Dict[str, Any]], session=None) -> Dict[str, int]:
+        """
+        Store a batch of events and their price snapshots
+
+        New events are inserted and existing ones are left as-is. A new
+        PriceSnapshot is only written when the price differs from the
+        event's latest snapshot. Everything is written in a single
+        transaction: a new one, or the given session's. Prices this
+        collector has committed are remembered, so later batches only query
+        for events it hasn't stored yet.
+
+        Returns:
+            Dictionary with "created", "updated" (new snapshot for an
+            existing event) and "unchanged" (same price, no snapshot) counts
+        """
+        if not batch:
+            return {"created": 0, "updated": 0, "unchanged": 0}
+
+        owns_session = session is None
+        session_scope = (
+            self.database.get_session() if owns_session else nullcontext(session)
+        )
+
+        with session_scope as session:
+            # Look up which events already exist in one query
+            ids = {event_data["id"] for event_data in batch}
+            known = ids & self._latest_prices.keys()
+            existing = known | self._existing_event_ids(session, ids - known)
+
+            # Only new events need inserting (first occurrence wins)
+            event_rows = {}
+            for event_data in batch:
+                if event_data["id"] in existing or event_data["id"] in event_rows:
+                    continue
+                event_rows[event_data["id"]] = {
+                    "id": event_data["id"],
+                    "name": event_data["name"],
+                    "event_type": event_data.get("event_type"),
+                    "start_date": event_data.get("start_date"),
+                    "venue_name": event_data.get("venue_name"),
+                    "city": event_data.get("city"),
+                    "state": event_data.get("state"),
+                    "url": event_data.get("url"),
+                }
+
+            created = len(event_rows)
+            if event_rows:
+                # executemany keeps large batches clear of SQLite's bound-parameter
+                # limit; ON CONFLICT still guards against a concurrent insert
+                dialect_insert = _INSERT_BY_DIALECT.get(
+                    self.database.engine.dialect.name
                 )
-                session.add(event)
-                return "created"
+                if dialect_insert is not None:
+                    stmt = dialect_insert(Event.__table__).on_conflict_do_nothing(
+                        index_elements=["id"]
+                    )
+                else:
+                    # Other backends: rows were already filtered by the
+                    # existence query above
+                    stmt = insert(Event.__table__)
+                session.execute(stmt, list(event_rows.values()))
+
+            # Latest known price of each existing event, in one query
+            latest = {event_id: self._latest_prices[event_id] for event_id in known}
+            if existing - known:
+                for row in session.execute(
+                    _SELECT_LATEST_PRICES, {"ids": list(existing - known)}
+                ):
+                    latest[row.event_id] = (row.min_price, row.max_price, row.currency)
+
+            # Add new PriceSnapshots, skipping prices we already have
+            snapshot_rows = []
+            unchanged = 0
+            for event_data in batch:
+                prices = (
+                    event_data.get("min_price"),
+                    event_data.get("max_price"),
+                    event_data.get("currency", "USD"),
+                )
+                if latest.get(event_data["id"]) == prices:
+                    unchanged += 1
+                    continue
 
-            else:
-                return "updated"
+                latest[event_data["id"]] = prices
+                snapshot_rows.append(
+                    {
+                        "event_id": event_data["id"],
+                        "min_price": prices[0],
+                        "max_price": prices[1],
+                        "currency": prices[2],
+                    }
+                )
 
-    def _collect_tracked_events(self) -> Dict:
-        """Collect fresh data for tracked events only"""
+            # Core inserts (on the tables, not the mapped classes) skip the ORM's
+            # per-row bulk-save bookkeeping; nothing here needs ORM objects
+            if snapshot_rows:
+                session.execute(insert(PriceSnapshot.__table__), snapshot_rows)
 
-        # TODO: Add --email filter to only collect specific user's tracked events
-        # TODO: Track consecutive failures and mark inactive after X attempts
+        # Only remember prices once committed; a caller's session may still
+        # roll back
+        if owns_session:
+            self._latest_prices.update(latest)
 
-        # 1. Query UserInterest for active events
-        with self.database.get_session() as session:
-            # 1. Query UserInterest for active events
-            tracked = session.query(UserInterest).filter_by(is_active=True).all()
+        return {
+            "created": created,
+            "updated": len(batch) - created - unchanged,
+            "unchanged": unchanged,
+        }
 
-            # Get event IDs for tracked interests
-            event_ids = [interest.event_id for interest in tracked]
+    def _fetch_event_details(self, event_ids: List[str]) -> Iterator[Tuple[str, Any]]:
+        """
+        Fetch details for many events concurrently
 
-            # Query events to check dates
-            events = session.query(Event).filter(Event.id.in_(event_ids)).all()
+        Yields (event_id, result) pairs as each request completes, where
+        result is the API response, None if the event was not found, or the
+        exception raised while fetching.
+        """
+        if not event_ids:
+            return
+
+        workers = min(Config.MAX_CONCURRENT_REQUESTS, len(event_ids))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = {
+                executor.submit(self.api_client.get_event_details, event_id): event_id
+                for event_id in event_ids
+            }
+
+            for future in as_completed(futures):
+                try:
+                    result = future.result()
+                except Exception as e:
+                    result = e
+                yield futures[future], result
 
-            # Build map of event_id -> event for date checking
-            event_map = {event.id: event for event in events}
+    def _collect_tracked_events(self) -> Dict:
+        """Collect fresh data for tracked events only"""
 
-            # 2. Filter out past events and deactivate them
-            now = datetime.now()
-            skipped = 0
-            active_event_ids = []
+        # TODO: Add --email filter to only collect specific user's tracked events
+        # TODO: Track consecutive failures and mark inactive after X attempts
 
-            for interest in tracked:
-                event = event_map.get(interest.event_id)
+        with self.database.get_session() as session:
+            # 1. Deactivate interests in events that have already started
+            skipped = session.execute(
+                _DEACTIVATE_PAST_INTERESTS, {"now": datetime.now(timezone.utc)}
+            ).rowcount
 
-                if event and event.start_date and event.start_date < now:
-                    # Event is in the past, mark as inactive
-                    interest.is_active = False
-                    skipped += 1
-                else:
-                    # Store just the ID, not the whole object
-                    active_event_ids.append(interest.event_id)
+            # 2. Get the event IDs of the remaining active interests
+            active_event_ids = session.scalars(_SELECT_ACTIVE_EVENT_IDS).all()
 
             # Session commits automatically when exiting with block
 
-        # 3. Collect data for active events (outside session is fine)
+        # Several users can track the same event; fetch and snapshot it once
+        active_event_ids = list(dict.fromkeys(active_event_ids))
+
         fetched = len(active_event_ids)
         updated = 0
+        unchanged = 0
         errors = []
 
-        for event_id in active_event_ids:
-            try:
-                # 3. Fetch from API
-                api_event = self.api_client.get_event_details(event_id)
+        # 3. Fetch from API outside the session (up to MAX_CONCURRENT_REQUESTS
+        # in flight, paced by the rate limiter), parsing each response as it
+        # arrives
+        parsed_events = []
 
-                if not api_event:
-                    errors.append({"event_id": event_id, "error": "Not found in API"})
-                    continue
+        for event_id, api_event in self._fetch_event_details(active_event_ids):
+            if isinstance(api_event, Exception):
+                errors.append({"event_id": event_id, "error": str(api_event)})
+                continue
 
-                # 4. Parse and store (creates new PriceSnapshot)
-                parsed = self.api_client.parse_event_data(api_event)
-                result = self.store_event(parsed)
-
-                if result == "updated":
-                    updated += 1
+            if not api_event:
+                errors.append({"event_id": event_id, "error": "Not found in API"})
+                continue
 
+            try:
+                parsed_events.append(self.api_client.parse_event_data(api_event))
             except Exception as e:
                 errors.append({"event_id": event_id, "error": str(e)})
 
+        # 4. Store all new PriceSnapshots in one batch
+        try:
+            counts = self.store_events(parsed_events)
+            updated = counts["updated"]
+            unchanged = counts["unchanged"]
+        except Exception as e:
+            for parsed in parsed_events:
+                errors.append({"event_id": parsed["id"], "error": str(e)})
+
         return {
             "fetched": fetched,
             "created": 0,  # Never creates new events in tracked mode
             "updated": updated,
+            "unchanged": unchanged,
+            "skipped": skipped,
             "errors": errors,
         }
 
     def collect_events(self, **search_params) -> Dict:
-        """Fetch events from API and store them"""
+        """
+        Fetch events from API and store them
+
+        With all_pages=True every page of results is streamed from the API
+        and stored in chunks of STORE_CHUNK_SIZE, so memory stays flat no
+        matter how many events match.
+        """
 
         if search_params.get("tracked_only"):
             return self._collect_tracked_events()
 
-        # Call API and count results
-        events = self.api_client.search_events(**search_params)
-        fetched = len(events)
+        # Call API (a single page, or a lazy iterator over every page)
+        if search_params.pop("all_pages", False):
+            events = self.api_client.iter_events(**search_params)
+        else:
+            events = self.api_client.search_events(**search_params)
 
         # Initialize counters
-        created = 0
-        updated = 0
+        totals = {"fetched": 0, "created": 0, "updated": 0, "unchanged": 0}
         errors = []
+        chunk = []
 
-        # Loop through events
+        # Parse events, storing each full chunk as we go
         for event in events:
+            totals["fetched"] += 1
             try:
-                # Parse and store
-                parsed = self.api_client.parse_event_data(event)
-                result = self.store_event(parsed)
-
-                if result == "created":
-                    created += 1
-                elif result == "updated":
-                    updated += 1
-
+                chunk.append(self.api_client.parse_event_data(event))
             except Exception as e:
                 errors.append(
                     {
@@ -153,9 +323,28 @@ class DataCollector:
                     }
                 )
 
-        return {
-            "fetched": fetched,
-            "created": created,
-            "updated": updated,
-            "errors": errors,
-        }
+            if len(chunk) >= STORE_CHUNK_SIZE:
+                self._store_chunk(chunk, totals, errors)
+                chunk = []
+
+        self._store_chunk(chunk, totals, errors)
+
+        return {**totals, "errors": errors}
+
+    def _store_chunk(self, chunk: List[Dict[str, Any]], totals: Dict, errors: List):
+        """Store a chunk of parsed events, adding its counts to totals"""
+        try:
+            counts = self.store_events(chunk)
+        except Exception as e:
+            for parsed in chunk:
+                errors.append(
+                    {
+                        "event_id": parsed["id"],
+                        "event_name": parsed["name"],
+                        "error": str(e),
+                    }
+                )
+            return
+
+        for key, count in counts.items():
+            totals[key] += count
@@ -1,4 +1,5 @@
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import make_url
 from sqlalchemy.orm import sessionmaker, Session
 from contextlib import contextmanager
 from src.db.models import Base
@@ -10,13 +11,46 @@ class Database:
 
     def __init__(self, database_url: str = None):
         self.database_url = database_url or Config.DATABASE_URL
-        self.engine = create_engine(self.database_url, echo=False)
-        self.SessionLocal = sessionmaker(bind=self.engine)
+        url = make_url(self.database_url)
+
+        engine_kwargs = {"echo": False}
+        if url.get_backend_name() == "postgresql":
+            engine_kwargs.update(pool_size=10, max_overflow=20, pool_pre_ping=True)
+
+        self.engine = create_engine(self.database_url, **engine_kwargs)
+
+        if url.get_backend_name() == "sqlite":
+            self._configure_sqlite(
+                file_backed=url.database not in (None, "", ":memory:")
+            )
+
+        # Keep loaded attributes after commit instead of re-SELECTing on access
+        self.SessionLocal = sessionmaker(bind=self.engine, expire_on_commit=False)
+
+    def _configure_sqlite(self, file_backed: bool):
+        """Tune SQLite on every new connection"""
+
+        @event.listens_for(self.engine, "connect")
+        def _set_sqlite_pragmas(dbapi_connection, connection_record):
+            cursor = dbapi_connection.cursor()
+            if file_backed:
+                # WAL lets readers run alongside a writer; NORMAL is safe under WAL
+                cursor.execute("PRAGMA journal_mode=WAL")
+                cursor.execute("PRAGMA synchronous=NORMAL")
+            cursor.execute("PRAGMA temp_store=MEMORY")
+            cursor.execute("PRAGMA mmap_size=268435456")
+            cursor.close()
 
     def create_tables(self):
-        """Create all tables in the database"""
+        """Create all tables (and any indexes missing from existing ones)"""
         Base.metadata.create_all(self.engine)
 
+        # create_all skips tables that already exist, so indexes added to
+        # the models later have to be created separately
+        for table in Base.metadata.sorted_tables:
+            for index in table.indexes:
+                index.create(self.engine, checkfirst=True)
+
     def drop_tables(self):
         """Drop all tables (use with caution!)"""
         Base.metadata.drop_all(self.engine)
@@ -6,6 +6,7 @@ from sqlalchemy import (
     Boolean,
     DateTime,
     ForeignKey,
+    Index,
     UniqueConstraint,
 )
 from sqlalchemy.orm import declarative_base
@@ -23,23 +24,32 @@ class Event(Base):
     id = Column(String, primary_key=True)  # Ticketmaster event ID
     name = Column(String, nullable=False)
     event_type = Column(String)  # concert, sports, etc.
-    start_date = Column(DateTime)
+    start_date = Column(DateTime(timezone=True))  # UTC
     venue_name = Column(String)
     city = Column(String)
     state = Column(String)
     url = Column(String)
-    created_at = Column(DateTime, default=lambda: datetime.now(timezone.utc))
+    created_at = Column(
+        DateTime(timezone=True), default=lambda: datetime.now(timezone.utc)
+    )
     updated_at = Column(
-        DateTime,
+        DateTime(timezone=True),
         default=lambda: datetime.now(timezone.utc),
         onupdate=lambda: datetime.now(timezone.utc),
     )
 
-    # Relationships
+    # Relationships (never lazy-loaded: use selectinload() so N+1s surface as errors)
     price_snapshots = relationship(
-        "PriceSnapshot", back_populates="event", cascade="all, delete-orphan"
+        "PriceSnapshot",
+        back_populates="event",
+        cascade="all, delete-orphan",
+        lazy="raise",
+        order_by="PriceSnapshot.snapshot_time",  # served by uix_event_snapshot
     )
 
+    # Speeds up filtering tracked events by date
+    __table_args__ = (Index("ix_events_start_date", "start_date"),)
+
     def __repr__(self):
         return f"<Event(id={self.id}, name={self.name}, date={self.start_date})>"
 
@@ -50,12 +60,16 @@ class PriceSnapshot(Base):
     __tablename__ = "price_snapshots"
 
     id = Column(Integer, primary_key=True, autoincrement=True)
-    event_id = Column(String, ForeignKey("events.id"), nullable=False)
+    event_id = Column(
+        String, ForeignKey("events.id", ondelete="CASCADE"), nullable=False
+    )
     min_price = Column(Float)
     max_price = Column(Float)
     currency = Column(String, default="USD")
     snapshot_time = Column(
-        DateTime, default=lambda: datetime.now(timezone.utc), nullable=False
+        DateTime(timezone=True),
+        default=lambda: datetime.now(timezone.utc),
+        nullable=False,
     )
 
     # Relationships
@@ -76,22 +90,32 @@ class UserInterest(Base):
     __tablename__ = "user_interests"
 
     id = Column(Integer, primary_key=True, autoincrement=True)
-    event_id = Column(String, ForeignKey("events.id"), nullable=False)
+    event_id = Column(
+        String, ForeignKey("events.id", ondelete="CASCADE"), nullable=False
+    )
     user_email = Column(String, nullable=False)
     target_price = Column(
         Float, nullable=True
     )  # Optional: alert when price drops below this
     is_active = Column(Boolean, default=True)  # Can stop tracking
-    created_at = Column(DateTime, default=lambda: datetime.now(timezone.utc))
+    created_at = Column(
+        DateTime(timezone=True), default=lambda: datetime.now(timezone.utc)
+    )
     updated_at = Column(
-        DateTime,
+        DateTime(timezone=True),
         default=lambda: datetime.now(timezone.utc),
         onupdate=lambda: datetime.now(timezone.utc),
     )
 
-    # Prevent duplicate tracking (same user, same event)
+    # Relationships (many-to-one: served from the identity map once the
+    # event is loaded in the session)
+    event = relationship("Event")
+
     __table_args__ = (
+        # Prevent duplicate tracking (same user, same event)
         UniqueConstraint("event_id", "user_email", name="uix_event_user"),
+        # Covers the active-interests lookup without touching the table
+        Index("ix_ui_active_event", "is_active", "event_id"),
     )
 
     def __repr__(self):
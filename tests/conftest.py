@@ -1,6 +1,23 @@
 import pytest
 import os
+from contextlib import contextmanager
+from sqlalchemy import event
+from sqlalchemy.orm import raiseload, selectinload
+from datetime import datetime
 from src.db.database import Database
+from src.db.models import Event
+
+# Column values for the sample_event fixture
+SAMPLE_EVENT_DATA = {
+    "id": "test_event_123",
+    "name": "Test Concert",
+    "event_type": "Music/Rock",
+    "start_date": datetime(2024, 12, 31, 20, 0, 0),
+    "venue_name": "Test Venue",
+    "city": "Los Angeles",
+    "state": "CA",
+    "url": "https://example.com/event",
+}
 
 
 @pytest.fixture(autouse=True)
@@ -15,12 +32,44 @@ def setup_test_env():
         del os.environ["DATABASE_URL"]
 
 
-@pytest.fixture
-def test_db():
-    """Create a test database in memory"""
-    db = Database("sqlite:///:memory:")
+@pytest.fixture(scope="session")
+def shared_db(tmp_path_factory):
+    """On-disk (WAL) test database, created once per test run"""
+    db = Database(f"sqlite:///{tmp_path_factory.mktemp('db') / 'test.db'}")
+
+    # pysqlite's own transaction handling breaks SAVEPOINTs; let SQLAlchemy
+    # emit BEGIN itself
+    @event.listens_for(db.engine, "connect")
+    def _disable_pysqlite_begin(dbapi_connection, connection_record):
+        dbapi_connection.isolation_level = None
+        # Tables created here have ON DELETE CASCADE; SQLite only runs it
+        # with foreign keys on
+        dbapi_connection.execute("PRAGMA foreign_keys=ON")
+
+    @event.listens_for(db.engine, "begin")
+    def _begin(conn):
+        conn.exec_driver_sql("BEGIN")
+
     db.create_tables()
-    return db
+    yield db
+    db.engine.dispose()
+
+
+@pytest.fixture
+def test_db(shared_db):
+    """Test database whose changes are rolled back after each test"""
+    connection = shared_db.engine.connect()
+    transaction = connection.begin()
+
+    # Sessions commit to a SAVEPOINT inside the outer transaction
+    shared_db.SessionLocal.configure(
+        bind=connection, join_transaction_mode="create_savepoint"
+    )
+    yield shared_db
+
+    shared_db.SessionLocal.configure(bind=shared_db.engine)
+    transaction.rollback()
+    connection.close()
 
 
 @pytest.fixture
@@ -55,17 +104,49 @@ def sample_raw_event():
 
 @pytest.fixture
 def sample_event():
-    """Sample event for database testing"""
-    from datetime import datetime
-    from src.db.models import Event
-
-    return Event(
-        id="test_event_123",
-        name="Test Concert",
-        event_type="Music/Rock",
-        start_date=datetime(2024, 12, 31, 20, 0, 0),
-        venue_name="Test Venue",
-        city="Los Angeles",
-        state="CA",
-        url="https://example.com/event",
-    )
+    """Sample event for database testing (a fresh instance per test)"""
+    return Event(**SAMPLE_EVENT_DATA)
+
+
+@pytest.fixture
+def eager():
+    """
+    Loader options for read-back queries: eager(*relationships)
+
+    Loads the given relationships with selectinload and makes any other
+    lazy load raise, so a test that quietly issues N+1 queries fails. Use
+    as query.options(*eager(...)) or session.get(..., options=eager(...)).
+    """
+
+    def _eager(*relationships):
+        return [
+            *(selectinload(relationship) for relationship in relationships),
+            raiseload("*"),
+        ]
+
+    return _eager
+
+
+@pytest.fixture
+def count_queries():
+    """
+    Record the SQL run on a connection or engine: count_queries(target)
+
+    Use as `with count_queries(session.connection()) as queries:`; queries
+    is the list of statements executed inside the block.
+    """
+
+    @contextmanager
+    def _count_queries(target):
+        queries = []
+
+        def _record(conn, cursor, statement, parameters, context, executemany):
+            queries.append(statement)
+
+        event.listen(target, "before_cursor_execute", _record)
+        try:
+            yield queries
+        finally:
+            event.remove(target, "before_cursor_execute", _record)
+
+    return _count_queries
@@ -1,3 +1,4 @@
+import json
 import pytest
 from unittest.mock import Mock, patch
 from datetime import datetime
@@ -45,13 +46,20 @@ class TestTicketmasterAPI:
         assert api.api_key == "test_key"
         assert api.base_url == "https://app.ticketmaster.com/discovery/v2"
 
-    @patch("src.api.ticketmaster.requests.get")
+    def test_connection_pool_fits_concurrent_workers(self, api_client):
+        """Test that every concurrent worker can keep its own pooled connection"""
+        from src.config import Config
+
+        adapter = api_client.session.get_adapter(api_client.base_url)
+        assert adapter._pool_maxsize == Config.MAX_CONCURRENT_REQUESTS
+
+    @patch("src.api.ticketmaster.requests.Session.get")
     def test_search_events_success(self, mock_get, api_client, sample_event_response):
         """Test successful event search"""
         mock_response = Mock()
-        mock_response.json.return_value = {
-            "_embedded": {"events": [sample_event_response]}
-        }
+        mock_response.content = json.dumps(
+            {"_embedded": {"events": [sample_event_response]}}
+        ).encode()
         mock_response.raise_for_status = Mock()
         mock_get.return_value = mock_response
 
@@ -61,11 +69,11 @@ class TestTicketmasterAPI:
         assert events[0]["id"] == "vvG1YZKS9rStch"
         assert mock_get.called
 
-    @patch("src.api.ticketmaster.requests.get")
+    @patch("src.api.ticketmaster.requests.Session.get")
     def test_search_events_no_results(self, mock_get, api_client):
         """Test event search with no results"""
         mock_response = Mock()
-        mock_response.json.return_value = {}
+        mock_response.content = b"{}"
         mock_response.raise_for_status = Mock()
         mock_get.return_value = mock_response
 
@@ -99,3 +107,161 @@ class TestTicketmasterAPI:
         assert parsed["min_price"] is None
         assert parsed["max_price"] is None
         assert parsed["venue_name"] is None
+
+    def test_get_event_details_returns_none_after_retries(self, api_client):
+        """Test a persistent 503 is retried, then reported as not found"""
+        import threading
+        from http.server import BaseHTTPRequestHandler, HTTPServer
+        from urllib3.util.retry import Retry
+
+        requests_seen = []
+
+        class _Unavailable(BaseHTTPRequestHandler):
+            def do_GET(self):
+                requests_seen.append(self.path)
+                self.send_response(503)
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+
+            def log_message(self, *args):
+                pass
+
+        server = HTTPServer(("127.0.0.1", 0), _Unavailable)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        try:
+            # Serve plain HTTP through the client's retrying adapter
+            api_client.base_url = f"http://127.0.0.1:{server.server_port}"
+            api_client.session.mount(
+                "http://", api_client.session.get_adapter("https://")
+            )
+            with patch.object(Retry, "sleep"):
+                assert api_client.get_event_details("vvG1YZKS9rStch") is None
+        finally:
+            server.shutdown()
+            server.server_close()
+
+        assert len(requests_seen) == 4  # first try + 3 retries
+
+    @patch("src.api.ticketmaster.requests.Session.get")
+    def test_repeated_request_is_cached(self, mock_get, api_client):
+        """Test identical requests within the TTL hit the API once"""
+        mock_response = Mock()
+        mock_response.content = b"{}"
+        mock_response.raise_for_status = Mock()
+        mock_get.return_value = mock_response
+
+        api_client.search_events(keyword="Taylor Swift")
+        api_client.search_events(keyword="Taylor Swift")
+        assert mock_get.call_count == 1
+
+        api_client.clear_cache()
+        api_client.search_events(keyword="Taylor Swift")
+        assert mock_get.call_count == 2
+
+    @patch("src.api.ticketmaster.requests.Session.get")
+    def test_event_details_are_not_cached(self, mock_get, api_client):
+        """Test event lookups always fetch fresh prices"""
+        mock_response = Mock()
+        mock_response.content = b"{}"
+        mock_response.raise_for_status = Mock()
+        mock_get.return_value = mock_response
+
+        api_client.get_event_details("vvG1YZKS9rStch")
+        api_client.get_event_details("vvG1YZKS9rStch")
+        assert mock_get.call_count == 2
+        assert not api_client._cache
+
+    @patch("src.api.ticketmaster.requests.Session.get")
+    def test_expired_responses_are_evicted(self, mock_get, api_client):
+        """Test that storing a response drops cached ones past their TTL"""
+        mock_response = Mock()
+        mock_response.content = b"{}"
+        mock_response.raise_for_status = Mock()
+        mock_get.return_value = mock_response
+        # The fake clock below would also drive the rate limiter
+        api_client.rate_limiter = Mock()
+
+        clock = {"now": 0.0}
+        with patch("src.api.ticketmaster.time.monotonic", lambda: clock["now"]):
+            api_client.search_events(keyword="Taylor Swift")
+            clock["now"] += api_client.cache_ttl + 1
+            api_client.search_events(keyword="Beyonce")
+
+        assert [key[1] for key in api_client._cache] == [
+            (("keyword", "Beyonce"), ("size", 20))
+        ]
+
+    @patch("src.api.ticketmaster.requests.Session.get")
+    def test_iter_events_stops_at_paging_limit(self, mock_get, api_client):
+        """Test all pages are fetched, stopping at the deep-paging limit"""
+
+        def _page_response(url, params, timeout):
+            mock_response = Mock()
+            mock_response.content = json.dumps(
+                {
+                    "_embedded": {"events": [{"id": f"event_{params['page']}"}]},
+                    "page": {"totalPages": 10},
+                }
+            ).encode()
+            mock_response.raise_for_status = Mock()
+            return mock_response
+
+        mock_get.side_effect = _page_response
+
+        events = list(api_client.iter_events(keyword="Taylor Swift", size=200))
+
+        # 200 * 5 = 1000, so only pages 0-4 are reachable
+        assert [e["id"] for e in events] == [f"event_{p}" for p in range(5)]
+        assert mock_get.call_count == 5
+
+    @patch("src.api.ticketmaster.requests.Session.get")
+    def test_iter_events_is_lazy(self, mock_get, api_client):
+        """Test pages are only fetched as the iterator is consumed"""
+
+        def _page_response(url, params, timeout):
+            mock_response = Mock()
+            mock_response.content = json.dumps(
+                {
+                    "_embedded": {"events": [{"id": f"event_{params['page']}"}]},
+                    "page": {"totalPages": 3},
+                }
+            ).encode()
+            mock_response.raise_for_status = Mock()
+            return mock_response
+
+        mock_get.side_effect = _page_response
+
+        events = api_client.iter_events(keyword="Taylor Swift")
+        assert next(events)["id"] == "event_0"
+        assert mock_get.call_count == 1
+
+        assert [e["id"] for e in events] == ["event_1", "event_2"]
+        assert mock_get.call_count == 3
+
+
+class TestRateLimiter:
+    def test_waits_when_bucket_is_empty(self):
+        """Test requests beyond the quota wait for the bucket to refill"""
+        from src.api.rate_limiter import RateLimiter
+
+        clock = {"now": 0.0}
+
+        def _sleep(seconds):
+            clock["now"] += seconds
+
+        with patch("src.api.rate_limiter.time.monotonic", lambda: clock["now"]):
+            with patch("src.api.rate_limiter.time.sleep", side_effect=_sleep):
+                limiter = RateLimiter(60, period=60.0, burst=2)
+
+                limiter.acquire()
+                limiter.acquire()
+                assert clock["now"] == 0.0  # Burst up to capacity is free
+
+                limiter.acquire()
+                assert clock["now"] == pytest.approx(1.0)  # 1 per second
+
+                # An idle client only builds up the burst, not a minute's quota
+                clock["now"] += 60
+                for _ in range(3):
+                    limiter.acquire()
+                assert clock["now"] == pytest.approx(62.0)
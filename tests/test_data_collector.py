@@ -1,4 +1,5 @@
 from datetime import datetime
+from sqlalchemy import insert
 from src.db.models import Event, PriceSnapshot
 from src.data_collector import DataCollector
 
@@ -32,7 +33,7 @@ def test_store_new_event_with_prices(test_db):
 
     # ASSERT: Check database has Event
     with test_db.get_session() as session:
-        event = session.query(Event).filter_by(id="test_event_123").first()
+        event = session.get(Event, "test_event_123")
         assert event is not None
         assert event.name == "Test Concert"
         assert event.city == "Los Angeles"
@@ -61,16 +62,16 @@ def test_store_existing_event_adds_snapshot(test_db):
         url="https://example.com",
     )
 
-    first_snapshot = PriceSnapshot(
-        event_id="test_event_123",
-        min_price=50.0,  # Original price
-        max_price=150.0,
-        currency="USD",
-    )
+    first_snapshot = {
+        "event_id": "test_event_123",
+        "min_price": 50.0,  # Original price
+        "max_price": 150.0,
+        "currency": "USD",
+    }
 
     with test_db.get_session() as session:
         session.add(first_event)
-        session.add(first_snapshot)
+        session.execute(insert(PriceSnapshot), [first_snapshot])
 
     # ARRANGE: Create new price data for same event
     updated_event_data = {
@@ -98,7 +99,7 @@ def test_store_existing_event_adds_snapshot(test_db):
 
     # ASSERT: TWO price snapshots exist now
     with test_db.get_session() as session:
-        event = session.query(Event).filter_by(id="test_event_123").first()
+        event = session.get(Event, "test_event_123")
         assert event is not None
 
         snapshots = (
@@ -140,7 +141,7 @@ def test_store_event_without_prices(test_db):
 
     # Assert snapshot exists with None prices
     with test_db.get_session() as session:
-        event = session.query(Event).filter_by(id="test_event_456").first()
+        event = session.get(Event, "test_event_456")
         assert event is not None
         assert event.name == "Free Concert"
 
@@ -220,8 +221,8 @@ def test_collect_events_success(test_db, sample_raw_event):
 
     # ASSERT: Check database
     with test_db.get_session() as session:
-        event1 = session.query(Event).filter_by(id="event_1").first()
-        event2 = session.query(Event).filter_by(id="event_2").first()
+        event1 = session.get(Event, "event_1")
+        event2 = session.get(Event, "event_2")
 
         assert event1 is not None
         assert event1.name == "Concert 1"
@@ -236,3 +237,237 @@ def test_collect_events_success(test_db, sample_raw_event):
         assert snapshots1[0].min_price == 50.0
         assert len(snapshots2) == 1
         assert snapshots2[0].min_price == 60.0
+
+
+def test_collect_tracked_events(test_db, sample_raw_event):
+    """Test refreshing tracked events fetches each one and records errors"""
+    from unittest.mock import Mock
+    from src.db.models import UserInterest
+
+    # ARRANGE: Two tracked events, one of which is gone from the API
+    with test_db.get_session() as session:
+        for event_id in ["event_1", "event_2"]:
+            session.add(Event(id=event_id, name=f"Concert {event_id}"))
+            session.add(UserInterest(event_id=event_id, user_email="a@example.com"))
+
+    mock_api = Mock()
+    mock_api.get_event_details.side_effect = lambda eid: (
+        sample_raw_event(event_id=eid) if eid == "event_1" else None
+    )
+    mock_api.parse_event_data.return_value = {"id": "event_1", "name": "Concert 1"}
+
+    collector = DataCollector(api_client=mock_api, database=test_db)
+
+    # ACT
+    result = collector.collect_events(tracked_only=True)
+
+    # ASSERT
+    assert result["fetched"] == 2
+    assert result["updated"] == 1
+    assert result["errors"] == [{"event_id": "event_2", "error": "Not found in API"}]
+    assert mock_api.get_event_details.call_count == 2
+
+
+def test_store_events_batch(test_db):
+    """Test that a batch stores new and existing events in one call"""
+    with test_db.get_session() as session:
+        session.add(Event(id="event_1", name="Concert 1"))
+
+    batch = [
+        {"id": "event_1", "name": "Concert 1", "min_price": 45.0, "max_price": 90.0},
+        {"id": "event_2", "name": "Concert 2", "min_price": 60.0, "max_price": 160.0},
+    ]
+
+    collector = DataCollector(api_client=None, database=test_db)
+    counts = collector.store_events(batch)
+
+    assert counts == {"created": 1, "updated": 1, "unchanged": 0}
+
+    with test_db.get_session() as session:
+        assert session.query(Event).count() == 2
+        assert session.query(PriceSnapshot).count() == 2
+
+
+def test_store_events_on_other_dialects(test_db, monkeypatch):
+    """Test that backends without ON CONFLICT support use a plain insert"""
+    monkeypatch.setattr("src.data_collector._INSERT_BY_DIALECT", {})
+
+    collector = DataCollector(api_client=None, database=test_db)
+    counts = collector.store_events([{"id": "event_1", "name": "Concert 1"}])
+
+    assert counts == {"created": 1, "updated": 0, "unchanged": 0}
+    with test_db.get_session() as session:
+        assert session.get(Event, "event_1") is not None
+
+
+def test_store_event_joins_callers_session(test_db):
+    """Test that store_event writes through a caller-owned session"""
+    collector = DataCollector(api_client=None, database=test_db)
+
+    with test_db.get_session() as session:
+        result = collector.store_event(
+            {"id": "test_event_789", "name": "Late Show"}, session=session
+        )
+        assert result == "created"
+
+        # Visible in the caller's transaction before it commits
+        assert session.get(Event, "test_event_789") is not None
+        session.rollback()
+
+    # Rolling back the caller's session discards the write
+    with test_db.get_session() as session:
+        assert session.get(Event, "test_event_789") is None
+
+
+def test_collect_tracked_events_dedupes_shared_events(test_db, sample_raw_event):
+    """Test an event tracked by several users is fetched and stored once"""
+    from unittest.mock import Mock
+    from src.db.models import UserInterest
+
+    with test_db.get_session() as session:
+        session.add(Event(id="event_1", name="Concert 1"))
+        for email in ["a@example.com", "b@example.com"]:
+            session.add(UserInterest(event_id="event_1", user_email=email))
+
+    mock_api = Mock()
+    mock_api.get_event_details.return_value = sample_raw_event(event_id="event_1")
+    mock_api.parse_event_data.return_value = {"id": "event_1", "name": "Concert 1"}
+
+    collector = DataCollector(api_client=mock_api, database=test_db)
+    result = collector.collect_events(tracked_only=True)
+
+    assert result["fetched"] == 1
+    assert mock_api.get_event_details.call_count == 1
+    with test_db.get_session() as session:
+        assert session.query(PriceSnapshot).count() == 1
+
+
+def test_store_event_skips_unchanged_price(test_db):
+    """Test that re-storing the same price does not add a snapshot"""
+    event_data = {
+        "id": "test_event_123",
+        "name": "Test Concert",
+        "min_price": 50.0,
+        "max_price": 150.0,
+        "currency": "USD",
+    }
+    collector = DataCollector(api_client=None, database=test_db)
+
+    assert collector.store_event(event_data) == "created"
+    assert collector.store_event(event_data) == "unchanged"
+    assert collector.store_event({**event_data, "min_price": 40.0}) == "updated"
+
+    with test_db.get_session() as session:
+        snapshots = (
+            session.query(PriceSnapshot)
+            .filter_by(event_id="test_event_123")
+            .order_by(PriceSnapshot.snapshot_time)
+            .all()
+        )
+        assert [snap.min_price for snap in snapshots] == [50.0, 40.0]
+
+
+def test_collect_tracked_events_skips_past_events(test_db, sample_raw_event):
+    """Test that interests in past events are deactivated and not fetched"""
+    from unittest.mock import Mock
+    from src.db.models import UserInterest
+
+    with test_db.get_session() as session:
+        session.add(Event(id="past", name="Old Show", start_date=datetime(2000, 1, 1)))
+        session.add(
+            Event(id="future", name="New Show", start_date=datetime(2999, 1, 1))
+        )
+        for event_id in ["past", "future"]:
+            session.add(UserInterest(event_id=event_id, user_email="a@example.com"))
+
+    mock_api = Mock()
+    mock_api.get_event_details.return_value = sample_raw_event(event_id="future")
+    mock_api.parse_event_data.return_value = {"id": "future", "name": "New Show"}
+
+    collector = DataCollector(api_client=mock_api, database=test_db)
+    result = collector.collect_events(tracked_only=True)
+
+    assert result["skipped"] == 1
+    assert result["fetched"] == 1
+    mock_api.get_event_details.assert_called_once_with("future")
+    with test_db.get_session() as session:
+        past = session.query(UserInterest).filter_by(event_id="past").one()
+        assert past.is_active is False
+
+
+def test_store_events_remembers_known_events(test_db, count_queries):
+    """Test that events stored earlier skip the existence query"""
+    collector = DataCollector(api_client=None, database=test_db)
+    collector.store_event({"id": "event_1", "name": "Concert 1", "min_price": 50.0})
+
+    with count_queries(test_db.engine) as queries:
+        result = collector.store_event(
+            {"id": "event_1", "name": "Concert 1", "min_price": 55.0}
+        )
+
+    assert result == "updated"
+    assert not any(q.startswith("SELECT events.id") for q in queries)
+
+
+def test_store_event_unchanged_price_skips_queries(test_db, count_queries):
+    """Test that a repeat of a price this collector stored needs no SQL"""
+    event_data = {"id": "event_1", "name": "Concert 1", "min_price": 50.0}
+    collector = DataCollector(api_client=None, database=test_db)
+    collector.store_event(event_data)
+
+    with count_queries(test_db.engine) as queries:
+        assert collector.store_event(event_data) == "unchanged"
+
+    assert not any(q.startswith("SELECT") for q in queries)
+
+
+def test_collect_events_all_pages_stores_in_chunks(test_db, monkeypatch):
+    """Test that streamed results are stored one chunk at a time"""
+    from unittest.mock import Mock
+    import src.data_collector
+
+    monkeypatch.setattr(src.data_collector, "STORE_CHUNK_SIZE", 2)
+
+    mock_api = Mock()
+    mock_api.iter_events.return_value = iter(
+        {"id": f"event_{i}", "name": f"Concert {i}"} for i in range(5)
+    )
+    mock_api.parse_event_data.side_effect = lambda event: event
+
+    collector = DataCollector(api_client=mock_api, database=test_db)
+    store_events = Mock(wraps=collector.store_events)
+    collector.store_events = store_events
+
+    result = collector.collect_events(city="Los Angeles", all_pages=True)
+
+    mock_api.iter_events.assert_called_once_with(city="Los Angeles")
+    mock_api.search_events.assert_not_called()
+    assert [len(call.args[0]) for call in store_events.call_args_list] == [2, 2, 1]
+    assert result["fetched"] == 5
+    assert result["created"] == 5
+
+
+def test_past_event_filter_uses_utc(test_db, monkeypatch):
+    """Test that an event that started in UTC is skipped whatever the local zone"""
+    import time
+    from datetime import timedelta, timezone
+    from unittest.mock import Mock
+    from src.db.models import UserInterest
+
+    # Local time well behind UTC, so a naive local "now" would lag the start
+    monkeypatch.setenv("TZ", "America/Los_Angeles")
+    time.tzset()
+    try:
+        started = datetime.now(timezone.utc) - timedelta(hours=1)
+        with test_db.get_session() as session:
+            session.add(Event(id="event_1", name="Concert 1", start_date=started))
+            session.add(UserInterest(event_id="event_1", user_email="a@example.com"))
+
+        collector = DataCollector(api_client=Mock(), database=test_db)
+        result = collector.collect_events(tracked_only=True)
+    finally:
+        monkeypatch.undo()
+        time.tzset()
+
+    assert result["skipped"] == 1
+    assert result["fetched"] == 0
@@ -1,83 +1,111 @@
 import pytest
 from datetime import datetime
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
-from src.db.models import Base, Event, PriceSnapshot, UserInterest
+from sqlalchemy import delete, insert
+from src.db.models import Event, PriceSnapshot, UserInterest
 
 
 class TestDatabase:
-    # In tests/test_db.py, replace the test_create_tables method with:
-
     def test_create_tables(self, test_db):
         """Test that tables are created successfully"""
         from sqlalchemy import inspect
 
-        inspector = inspect(test_db.engine)
-        table_names = inspector.get_table_names()
+        with test_db.get_session() as session:
+            table_names = inspect(session.connection()).get_table_names()
 
         # Tables should exist after initialization
         assert "events" in table_names
         assert "price_snapshots" in table_names
         assert "user_interests" in table_names
 
-    def test_add_event(self, test_db, sample_event):
+    def test_add_event(self, test_db, sample_event, eager):
         """Test adding an event to database"""
         with test_db.get_session() as session:
             session.add(sample_event)
 
-        with test_db.get_session() as session:
-            event = session.query(Event).filter_by(id="test_event_123").first()
+            # Flush, and clear the identity map so the reads below hit the database
+            session.flush()
+            session.expunge_all()
+
+            event = session.get(Event, "test_event_123", options=eager())
             assert event is not None
             assert event.name == "Test Concert"
             assert event.city == "Los Angeles"
 
-    def test_add_price_snapshot(self, test_db, sample_event):
+    def test_objects_usable_after_commit(self, test_db, sample_event):
+        """Test that committed objects keep their loaded attributes"""
+        with test_db.get_session() as session:
+            session.add(sample_event)
+
+        # Session is closed; an expired object would raise DetachedInstanceError
+        assert sample_event.name == "Test Concert"
+
+    def test_add_price_snapshot(self, test_db, sample_event, eager, count_queries):
         """Test adding price snapshots to an event"""
         with test_db.get_session() as session:
             session.add(sample_event)
 
-            snapshot = PriceSnapshot(
-                event_id=sample_event.id,
-                min_price=50.0,
-                max_price=150.0,
-                currency="USD",
+            session.execute(
+                insert(PriceSnapshot),
+                [
+                    {
+                        "event_id": sample_event.id,
+                        "min_price": 50.0,
+                        "max_price": 150.0,
+                        "currency": "USD",
+                    }
+                ],
             )
-            session.add(snapshot)
 
-        with test_db.get_session() as session:
-            event = session.query(Event).filter_by(id="test_event_123").first()
-            assert len(event.price_snapshots) == 1
-            assert event.price_snapshots[0].min_price == 50.0
+            session.flush()
+            session.expunge_all()
+
+            # One SELECT for the event, one for its snapshots
+            with count_queries(session.connection()) as queries:
+                event = session.get(
+                    Event, "test_event_123", options=eager(Event.price_snapshots)
+                )
+                assert len(event.price_snapshots) == 1
+                assert event.price_snapshots[0].min_price == 50.0
 
-    def test_multiple_price_snapshots(self, test_db, sample_event):
+            assert len(queries) == 2
+
+    def test_multiple_price_snapshots(self, test_db, sample_event, eager):
         """Test adding multiple price snapshots over time"""
         with test_db.get_session() as session:
             session.add(sample_event)
 
-            snapshot1 = PriceSnapshot(
-                event_id=sample_event.id,
-                min_price=50.0,
-                max_price=150.0,
-                snapshot_time=datetime(2024, 1, 1, 12, 0, 0),
-            )
-            snapshot2 = PriceSnapshot(
-                event_id=sample_event.id,
-                min_price=45.0,
-                max_price=140.0,
-                snapshot_time=datetime(2024, 1, 2, 12, 0, 0),
+            # Inserted newest first; the relationship orders by snapshot_time
+            session.execute(
+                insert(PriceSnapshot),
+                [
+                    {
+                        "event_id": sample_event.id,
+                        "min_price": 45.0,
+                        "max_price": 140.0,
+                        "snapshot_time": datetime(2024, 1, 2, 12, 0, 0),
+                    },
+                    {
+                        "event_id": sample_event.id,
+                        "min_price": 50.0,
+                        "max_price": 150.0,
+                        "snapshot_time": datetime(2024, 1, 1, 12, 0, 0),
+                    },
+                ],
             )
-            session.add_all([snapshot1, snapshot2])
 
-        with test_db.get_session() as session:
-            event = session.query(Event).filter_by(id="test_event_123").first()
+            session.flush()
+            session.expunge_all()
+
+            event = session.get(
+                Event, "test_event_123", options=eager(Event.price_snapshots)
+            )
             assert len(event.price_snapshots) == 2
 
-            # Check that prices changed
-            snapshots = sorted(event.price_snapshots, key=lambda s: s.snapshot_time)
-            assert snapshots[0].min_price == 50.0
-            assert snapshots[1].min_price == 45.0  # Price dropped
+            # Check that prices changed (snapshots load oldest first)
+            assert event.price_snapshots[0].min_price == 50.0
+            assert event.price_snapshots[1].min_price == 45.0  # Price dropped
 
-    def test_user_interest(self, test_db, sample_event):
+    def test_user_interest(self, test_db, sample_event, eager):
         """Test tracking user interest in an event"""
         with test_db.get_session() as session:
             session.add(sample_event)
@@ -89,34 +117,104 @@ class TestDatabase:
             )
             session.add(interest)
 
-        with test_db.get_session() as session:
+            session.flush()
+            session.expunge_all()
+
             interest = (
-                session.query(UserInterest).filter_by(event_id="test_event_123").first()
+                session.query(UserInterest)
+                .options(*eager())
+                .filter_by(event_id="test_event_123")
+                .first()
             )
             assert interest is not None
             assert interest.user_email == "test@example.com"
             assert interest.target_price == 100.0
 
-    def test_cascade_delete(self, test_db, sample_event):
+    def test_cascade_delete(self, test_db, sample_event, eager):
         """Test that price snapshots are deleted when event is deleted"""
         with test_db.get_session() as session:
             session.add(sample_event)
-            snapshot = PriceSnapshot(
-                event_id=sample_event.id, min_price=50.0, max_price=150.0
+            session.execute(
+                insert(PriceSnapshot),
+                [{"event_id": sample_event.id, "min_price": 50.0, "max_price": 150.0}],
             )
-            session.add(snapshot)
 
-        with test_db.get_session() as session:
-            event = session.query(Event).filter_by(id="test_event_123").first()
-            session.delete(event)
+            session.flush()
+            session.expunge_all()
+
+            # One DELETE; the database removes the snapshots (ON DELETE CASCADE)
+            session.execute(
+                delete(Event).where(Event.id == "test_event_123"),
+                execution_options={"synchronize_session": False},
+            )
 
-        with test_db.get_session() as session:
             # Event should be deleted
-            event = session.query(Event).filter_by(id="test_event_123").first()
+            event = session.get(Event, "test_event_123", options=eager())
             assert event is None
 
             # Price snapshots should also be deleted (cascade)
             snapshots = (
-                session.query(PriceSnapshot).filter_by(event_id="test_event_123").all()
+                session.query(PriceSnapshot)
+                .options(*eager())
+                .filter_by(event_id="test_event_123")
+                .all()
             )
             assert len(snapshots) == 0
+
+    def test_orm_delete_cascades_without_foreign_keys(self, tmp_path, eager):
+        """Test that session.delete(event) removes snapshots on its own"""
+        from src.db.database import Database
+
+        # Databases created before ON DELETE CASCADE rely on the ORM cascade
+        db = Database(f"sqlite:///{tmp_path / 'orm_cascade.db'}")
+        db.create_tables()
+        with db.get_session() as session:
+            session.add(Event(id="event_1", name="Concert 1"))
+            session.add(PriceSnapshot(event_id="event_1", min_price=50.0))
+
+        with db.get_session() as session:
+            event = session.get(Event, "event_1", options=eager(Event.price_snapshots))
+            session.delete(event)
+
+        with db.get_session() as session:
+            assert session.query(PriceSnapshot).count() == 0
+        db.engine.dispose()
+
+    def test_price_snapshots_are_not_lazy_loaded(self, test_db, sample_event):
+        """Test that touching an unloaded price_snapshots collection raises"""
+        from sqlalchemy.exc import InvalidRequestError
+
+        with test_db.get_session() as session:
+            session.add(sample_event)
+
+        with test_db.get_session() as session:
+            event = session.get(Event, "test_event_123")
+            with pytest.raises(InvalidRequestError):
+                event.price_snapshots
+
+    def test_sqlite_file_uses_wal(self, tmp_path):
+        """Test that file-backed SQLite databases run in WAL mode"""
+        from sqlalchemy import text
+        from src.db.database import Database
+
+        db = Database(f"sqlite:///{tmp_path}/test.db")
+
+        with db.engine.connect() as conn:
+            assert conn.execute(text("PRAGMA journal_mode")).scalar() == "wal"
+            assert conn.execute(text("PRAGMA synchronous")).scalar() == 1  # NORMAL
+
+    def test_create_tables_adds_missing_indexes(self, tmp_path):
+        """Test that create_tables adds new indexes to existing tables"""
+        from sqlalchemy import inspect, text
+        from src.db.database import Database
+
+        db = Database(f"sqlite:///{tmp_path / 'indexes.db'}")
+        db.create_tables()
+        with db.engine.begin() as conn:
+            conn.execute(text("DROP INDEX ix_ui_active_event"))
+
+        db.create_tables()
+
+        indexes = {i["name"] for i in inspect(db.engine).get_indexes("user_interests")}
+        assert "ix_ui_active_event" in indexes
+        db.engine.dispose()